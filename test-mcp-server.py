@@ -3,6 +3,8 @@
 Simple working MCP test that maintains a persistent server process
 """
 
+import argparse
+import errno
 import json
 import subprocess
 import sys
@@ -10,19 +12,233 @@ import time
 import os
 import signal
 import socket
-import platform
 import glob
-from typing import Dict, Any, Optional
+import itertools
+import queue
+import shutil
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+# Buffer size for the server's stdin pipe; also the size of each raw stdout read
+PIPE_BUFFER_SIZE = 65536
+
+# orjson parses the server's byte lines directly; fall back to the stdlib
+try:
+    import orjson
+    _dumps = orjson.dumps
+    _loads = orjson.loads
+except ImportError:
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
+    _loads = json.loads
+
+# requests is only needed for the HTTP mode check
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+def _run_sql(sql: str, params: Optional[List[Any]] = None) -> Dict[str, Any]:
+    """tools/call params for the run_sql tool"""
+    arguments = {"sql": sql} if params is None else {"sql": sql, "params": params}
+    return {"name": "run_sql", "arguments": arguments}
+
+# STDIO test cases as (name, method, params), in the order the server must see them.
+# Requests get ids 1, 2, ... in order; notifications get none.
+_CASES = [
+    ("Initialize", "initialize", {
+        "protocolVersion": "2025-11-25",
+        "capabilities": {"tools": {}, "resources": {}},
+        "clientInfo": {"name": "test", "version": "1.0"}
+    }),
+    # Required after initialize
+    ("Initialized Notification", "notifications/initialized", {}),
+    # Warm up the JDBC connection path so the first measured SQL call isn't an outlier;
+    # shipped in the same write as the rest and left out of the pass/fail counts
+    ("Warmup", "tools/call", _run_sql("SELECT 1")),
+    ("List Tools", "tools/list", {}),
+    ("List Resources", "resources/list", {}),
+    ("Read Database Info", "resources/read", {"uri": "database://info"}),
+    ("Create Table", "tools/call",
+     _run_sql("CREATE TABLE test_table (id INT PRIMARY KEY, name VARCHAR(50), created_date DATE)")),
+    # Insert all rows in one call; parameterized so placeholder binding stays covered
+    ("Insert Data", "tools/call",
+     _run_sql("INSERT INTO test_table VALUES (?, ?, ?), (?, ?, ?), (?, ?, ?)",
+              [1, "John Doe", "2024-01-01",
+               2, "Jane Smith", "2024-01-02",
+               3, "Alice Brown", "2024-01-03"])),
+    ("Select Data", "tools/call", _run_sql("SELECT * FROM test_table ORDER BY id")),
+    ("Describe Table", "tools/call", {"name": "describe_table", "arguments": {"table_name": "test_table"}}),
+    ("Read Table Metadata", "resources/read", {"uri": "database://table/TEST_TABLE"}),
+    ("Parameterized Select (Single)", "tools/call", _run_sql("SELECT * FROM test_table WHERE id = ?", [3])),
+    ("Parameterized Select (Multiple)", "tools/call",
+     _run_sql("SELECT * FROM test_table WHERE name LIKE ? AND id > ?", ["%e%", 1])),
+    ("Parameterized Select (Range)", "tools/call",
+     _run_sql("SELECT * FROM test_table WHERE id BETWEEN ? AND ? ORDER BY id", [2, 4])),
+    # Empty params array (backward compatibility)
+    ("Empty Params Array", "tools/call", _run_sql("SELECT COUNT(*) as total_count FROM test_table", [])),
+]
+
+# Cases that only prepare the server; they are not counted and use an int id below
+# the numbered range (which starts at 1) so the ids stay sortable
+_WARMUP_CASES = frozenset({"Warmup"})
+_WARMUP_ID = 0
+
+def _build_tests(cases) -> List[Dict[str, Any]]:
+    """Wrap each (name, method, params) case in a JSON-RPC 2.0 request"""
+    tests = []
+    next_id = 1
+    for name, method, params in cases:
+        request = {"jsonrpc": "2.0"}
+        warmup = name in _WARMUP_CASES
+        if warmup:
+            request["id"] = _WARMUP_ID
+        elif not method.startswith("notifications/"):
+            request["id"] = next_id
+            next_id += 1
+        request["method"] = method
+        request["params"] = params
+        tests.append({"name": name, "request": request, "warmup": warmup})
+    return tests
+
+_TESTS = _build_tests(_CASES)
+
+# (name, request, request encoded as one newline-terminated line, is_warmup), encoded once at import
+_SERIALIZED = [(test['name'], test['request'], _dumps(test['request']) + b"\n", test.get('warmup', False))
+               for test in _TESTS]
+
+# PID and JAR (path and mtime) of the HTTP server that --keep-alive leaves running between runs
+KEEP_ALIVE_PID_FILE = ".dbchat-test.pid"
+
+# HTTP mode requests, encoded once and posted as-is
+_HTTP_MCP_URL = "http://localhost:8080/mcp"
+_HTTP_HEALTH_URL = "http://localhost:8080/health"
+_HTTP_INIT_BODY = _dumps({
+    "jsonrpc": "2.0",
+    "id": 1,
+    "method": "initialize",
+    "params": {
+        "protocolVersion": "2025-11-25",
+        "capabilities": {"tools": {}, "resources": {}},
+        "clientInfo": {"name": "http-test", "version": "1.0"}
+    }
+})
+_HTTP_INITIALIZED_BODY = _dumps({
+    "jsonrpc": "2.0",
+    "method": "notifications/initialized",
+    "params": {}
+})
+_HTTP_TOOLS_LIST_BODY = _dumps({
+    "jsonrpc": "2.0",
+    "id": 2,
+    "method": "tools/list",
+    "params": {}
+})
+
+def _http_port_in_use() -> bool:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        # A listener that never accepts can leave connect() hanging; anything but a refusal means taken
+        sock.settimeout(1)
+        return sock.connect_ex(('localhost', 8080)) != errno.ECONNREFUSED
+
+def _terminate_pid(pid: int, timeout: float = 3.0):
+    """Terminate a server we no longer hold a Popen handle for, killing it if it lingers"""
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError:
+        return  # Already gone
+    
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            os.kill(pid, 0)
+        except OSError:
+            return
+        time.sleep(0.05)
+    try:
+        os.kill(pid, signal.SIGKILL)
+    except OSError:
+        pass
+
+def _jar_identity(jar_path: str) -> Tuple[str, int]:
+    """(absolute path, mtime in ns) of a JAR, so a rebuilt JAR no longer matches"""
+    return os.path.abspath(jar_path), os.stat(jar_path).st_mtime_ns
+
+def _runs_jar(pid: int, jar_path: str) -> bool:
+    """Whether pid is a live process started with `-jar jar_path`; False where ps cannot tell"""
+    if sys.platform == "win32":
+        return False
+    try:
+        args = subprocess.run(["ps", "-p", str(pid), "-o", "args="], capture_output=True,
+                              text=True, timeout=5).stdout
+    except (OSError, subprocess.SubprocessError):
+        return False
+    return f"-jar {jar_path}" in args
+
+def _read_kept_server() -> Optional[Dict[str, Any]]:
+    """The record --keep-alive wrote for its HTTP server; None if missing or unreadable"""
+    try:
+        with open(KEEP_ALIVE_PID_FILE, "rb") as f:
+            record = _loads(f.read())
+    except (OSError, ValueError):
+        return None
+    if (not isinstance(record, dict) or not isinstance(record.get("pid"), int)
+            or not isinstance(record.get("jar"), str) or not record["jar"]):
+        return None
+    return record
+
+def stop_kept_http_server() -> bool:
+    """Stop the HTTP server recorded in KEEP_ALIVE_PID_FILE; False if there is none"""
+    if not os.path.exists(KEEP_ALIVE_PID_FILE):
+        return False
+    
+    # The PID may have been reused since it was recorded; only signal our own server,
+    # otherwise just forget the stale record
+    record = _read_kept_server()
+    if record and _http_port_in_use():
+        if _runs_jar(record["pid"], record["jar"]):
+            _terminate_pid(record["pid"])
+            print(f"Stopped the kept HTTP server (PID {record['pid']})")
+        else:
+            print(f"PID {record['pid']} is no longer the kept HTTP server, leaving it running")
+    elif record:
+        print(f"The kept HTTP server (PID {record['pid']}) has already exited")
+    os.remove(KEEP_ALIVE_PID_FILE)
+    return True
 
 class SimpleMCPTester:
-    def __init__(self, jar_path: str):
+    def __init__(self, jar_path: str, keep_alive: bool = False):
         self.jar_path = jar_path
         self.java_path = "java"
         self.process = None
         self._stderr_thread = None
-        self._stderr_buffer = []
+        self._stderr_buffer = deque(maxlen=200)
+        self._http_stderr_buffer = deque(maxlen=200)
+        # Server stderr is only captured (and drained by a thread) when DBCHAT_DEBUG is set
+        self.debug = bool(os.environ.get("DBCHAT_DEBUG"))
+        self._stdout_thread = None
+        self._stdout_queue = None
+        self._http_session = None
+        # --keep-alive: leave a passing HTTP server running for the next run to reuse
+        self.keep_alive = keep_alive
+        self._http_reused = False
+        self._http_kept = None
+        self._http_jar_identity = None
+        os.makedirs("test-db", exist_ok=True)
+        # Built once; Popen only reads them
+        self._env = self._build_env()
+        self._http_env = dict(self._env, HTTP_MODE='true', HTTP_PORT='8080')
         
     def setup_env(self):
+        """Environment for the STDIO server process"""
+        return self._env
+
+    def _build_env(self):
         """Setup environment variables"""
         env = os.environ.copy()
         env.update({
@@ -46,11 +262,12 @@ class SimpleMCPTester:
             cmd,
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
+            stderr=subprocess.PIPE if self.debug else subprocess.DEVNULL,
+            bufsize=PIPE_BUFFER_SIZE,
             env=env
         )
         self._start_stderr_drain()
+        self._start_stdout_reader()
 
     def _start_stderr_drain(self):
         if not self.process or not self.process.stderr or self._stderr_thread:
@@ -58,37 +275,100 @@ class SimpleMCPTester:
 
         def drain():
             for line in self.process.stderr:
-                # Keep a small tail for debugging while preventing stderr pipe blocking.
+                # Keep a small tail for debugging while preventing stderr pipe blocking;
+                # the bounded deque drops the oldest line itself
                 self._stderr_buffer.append(line)
-                if len(self._stderr_buffer) > 200:
-                    self._stderr_buffer.pop(0)
 
-        import threading
         self._stderr_thread = threading.Thread(target=drain, daemon=True)
         self._stderr_thread.start()
+
+    def _start_stdout_reader(self):
+        # One reader for the life of the process; callers wait on the queue with a timeout,
+        # which works on every platform (select() does not support pipes on Windows)
+        if not self.process or not self.process.stdout or self._stdout_thread:
+            return
+
+        self._stdout_queue = queue.Queue()
+
+        def reader(fd, line_queue):
+            # Large raw reads straight from the fd: a single read often carries several
+            # pipelined replies, which are split out of one persistent buffer
+            pending = bytearray()
+            try:
+                while True:
+                    chunk = os.read(fd, PIPE_BUFFER_SIZE)
+                    if not chunk:
+                        break
+                    pending += chunk
+                    if b"\n" not in chunk:
+                        continue
+                    lines = pending.split(b"\n")
+                    pending = lines.pop()
+                    for line in lines:
+                        if line.strip():
+                            line_queue.put(bytes(line))
+                if pending.strip():
+                    line_queue.put(bytes(pending))
+            except Exception:
+                pass
+            finally:
+                # None marks end of output
+                line_queue.put(None)
+
+        self._stdout_thread = threading.Thread(target=reader, args=(self.process.stdout.fileno(), self._stdout_queue),
+                                               daemon=True)
+        self._stdout_thread.start()
+
+    def _read_line(self, timeout: float = 15) -> Optional[bytes]:
+        """Next non-empty stdout line; None at end of output, queue.Empty on timeout"""
+        line = self._stdout_queue.get(timeout=timeout)
+        if line is None:
+            # Leave the end marker for any later read
+            self._stdout_queue.put(None)
+        return line
         
     def stop_process(self):
         """Stop the MCP server process"""
         if self.process:
             try:
-                self.process.stdin.close()
-                self.process.terminate()
-                self.process.wait(timeout=5)
-            except:
-                if self.process.poll() is None:
-                    self.process.kill()
+                # A well-behaved server exits on stdin EOF; only escalate if it doesn't
+                try:
+                    self.process.stdin.close()
+                except OSError:
+                    pass  # Server already gone; flushing the pipe failed
+                try:
+                    self.process.wait(timeout=1.0)
+                except subprocess.TimeoutExpired:
+                    self.process.terminate()
+                    try:
+                        self.process.wait(timeout=3.0)
+                    except subprocess.TimeoutExpired:
+                        self.process.kill()
+                        self.process.wait()
+                if self._stdout_thread:
+                    self._stdout_thread.join(timeout=0.5)
             finally:
                 self.process = None
                 self._stderr_thread = None
+                self._stdout_thread = None
+                self._stdout_queue = None
+
+    def _print_stderr_tail(self, count: int = 10, buffer: Optional[deque] = None,
+                           report: Callable[[str], None] = print):
+        """Print the last count lines captured from a server's stderr, the STDIO server's by default"""
+        report("Server stderr (tail):")
+        if buffer is None:
+            buffer = self._stderr_buffer
+        for line in itertools.islice(buffer, max(0, len(buffer) - count), None):
+            report(line.decode(errors="replace").rstrip())
 
-    def send_request(self, request: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        """Send a request to the persistent process"""
+    def send_request(self, request: Dict[str, Any], line: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+        """Send a request to the persistent process, using line as the pre-encoded request if given"""
         if not self.process:
             return None
             
         try:
-            input_data = json.dumps(request) + "\n"
-            self.process.stdin.write(input_data)
+            self.process.stdin.write(line or (_dumps(request) + b"\n"))
             self.process.stdin.flush()
             
             # Notifications (no 'id' field) don't expect a response
@@ -96,49 +376,16 @@ class SimpleMCPTester:
                 return None
             
             # Read response for requests with id with timeout
-            import select
-            import sys
-            
-            if sys.platform == "win32":
-                # Windows doesn't support select on pipes, use a different approach
-                import threading
-                import queue
-                
-                def read_with_timeout(process, timeout=10):
-                    result_queue = queue.Queue()
-                    
-                    def reader():
-                        try:
-                            line = process.stdout.readline()
-                            result_queue.put(line)
-                        except Exception as e:
-                            result_queue.put(None)
-                    
-                    thread = threading.Thread(target=reader)
-                    thread.daemon = True
-                    thread.start()
-                    
-                    try:
-                        response_line = result_queue.get(timeout=timeout)
-                        return response_line
-                    except queue.Empty:
-                        print(f"Timeout waiting for response to request: {request.get('method', 'unknown')}")
-                        return None
-                
-                response_line = read_with_timeout(self.process, timeout=15)
-            else:
-                # Unix-like systems can use select
-                ready, _, _ = select.select([self.process.stdout], [], [], 15)
-                if ready:
-                    response_line = self.process.stdout.readline()
-                else:
-                    print(f"Timeout waiting for response to request: {request.get('method', 'unknown')}")
-                    return None
+            try:
+                response_line = self._read_line(timeout=15)
+            except queue.Empty:
+                print(f"Timeout waiting for response to request: {request.get('method', 'unknown')}")
+                return None
             
-            if not response_line or not response_line.strip():
+            if response_line is None:
                 return None
                 
-            return json.loads(response_line.strip())
+            return _loads(response_line)
             
         except json.JSONDecodeError as e:
             print(f"JSON parse error: {e}")
@@ -147,132 +394,283 @@ class SimpleMCPTester:
         except Exception as e:
             print(f"Error sending request: {e}")
             if self._stderr_buffer:
-                print("Server stderr (tail):")
-                for line in self._stderr_buffer[-10:]:
-                    print(line.rstrip())
+                self._print_stderr_tail()
+            return None
+
+    def send_requests_batch(self, requests: List[Dict[str, Any]],
+                            lines: Optional[List[bytes]] = None) -> Dict[Any, Dict[str, Any]]:
+        """Pipeline all requests through a single write and return the responses keyed by id
+
+        lines, if given, holds each request already encoded as a newline-terminated line.
+        """
+        responses = {}
+        if not self.process:
+            return responses
+
+        pending = {request['id'] for request in requests if 'id' in request}
+        try:
+            if lines is None:
+                lines = [_dumps(request) + b"\n" for request in requests]
+            self.process.stdin.write(b"".join(lines))
+            self.process.stdin.flush()
+        except Exception as e:
+            print(f"Error sending requests: {e}")
+            return responses
+
+        while pending:
+            try:
+                response_line = self._read_line(timeout=15)
+            except queue.Empty:
+                print(f"Timeout waiting for responses to request ids: {sorted(pending)}")
+                break
+            if response_line is None:
+                print("Server closed stdout before answering every request")
+                break
+
+            try:
+                response = _loads(response_line)
+            except json.JSONDecodeError as e:
+                print(f"JSON parse error: {e}")
+                print(f"Raw output: {response_line}")
+                continue
+
+            response_id = response.get('id')
+            responses[response_id] = response
+            pending.discard(response_id)
+
+        if pending:
+            if self._stderr_buffer:
+                self._print_stderr_tail()
+            elif not self.debug:
+                print("Set DBCHAT_DEBUG=1 to capture the server's stderr")
+        return responses
+
+    def test_http_mode(self, server: Optional[Future] = None, messages: Optional[List[str]] = None) -> bool:
+        """Test HTTP mode
+
+        server, if given, is a pending start_http_server() call launched earlier so the
+        HTTP JVM could boot while the STDIO tests ran; messages collects what that call
+        reported, held back until now so it does not land among the STDIO results.
+        """
+        if self._http_reused:
+            # The kept server finished its MCP handshake in the run that started it
+            try:
+                return bool(self._exercise_http(handshake=False))
+            finally:
+                self._close_http_session()
+        
+        if server:
+            process = server.result()
+            for message in messages or ():
+                print(message)
+        else:
+            conflict = self.http_port_conflict()
+            if conflict:
+                print(conflict)
+                return False
+            skip_reason = self.http_skip_reason()
+            if skip_reason:
+                print(skip_reason)
+                return True
+            process = self.start_http_server()
+        
+        ok = False
+        try:
+            ok = bool(process) and bool(self._exercise_http())
+            return ok
+        finally:
+            if ok and self.keep_alive:
+                self.keep_http_server(process)
+            else:
+                self.stop_http_server(process)
+
+    def reuse_http_server(self) -> bool:
+        """With --keep-alive, attach to the HTTP server a previous run left running"""
+        if not (self.keep_alive and HAS_REQUESTS and os.path.exists(KEEP_ALIVE_PID_FILE)):
+            return False
+        
+        # A server started from an older build of the JAR would test the wrong code
+        record = _read_kept_server()
+        if (not record or (os.path.abspath(record["jar"]), record.get("jar_mtime"))
+                != _jar_identity(self.jar_path)):
+            print(f"Kept HTTP server from {KEEP_ALIVE_PID_FILE} was not started from the current "
+                  f"{self.jar_path}, stopping it")
+            stop_kept_http_server()
+            return False
+        
+        self._open_http_session()
+        try:
+            if self._http_session.get(_HTTP_HEALTH_URL, timeout=2).status_code == 200:
+                print(f"Reusing HTTP server from {KEEP_ALIVE_PID_FILE}")
+                self._http_reused = True
+                return True
+        except requests.exceptions.RequestException:
+            pass
+        
+        # The kept server is gone or no longer healthy; make sure it is stopped so a fresh one can bind
+        self._close_http_session()
+        print(f"Kept HTTP server from {KEEP_ALIVE_PID_FILE} is not healthy, stopping it")
+        stop_kept_http_server()
+        return False
+
+    def keep_http_server(self, process: subprocess.Popen):
+        """Leave a started HTTP server running and record its PID and JAR for later runs"""
+        self._close_http_session()
+        self._http_kept = process
+        _, jar_mtime = self._http_jar_identity
+        with open(KEEP_ALIVE_PID_FILE, "wb") as f:
+            f.write(_dumps({"pid": process.pid, "jar": self.jar_path, "jar_mtime": jar_mtime}))
+        print(f"HTTP server left running (PID {process.pid}, recorded in {KEEP_ALIVE_PID_FILE})")
+
+    def http_skip_reason(self) -> Optional[str]:
+        """Why the HTTP test cannot run here, or None if it can"""
+        if not HAS_REQUESTS:
+            return "Requests library not available, skipping HTTP test"
+        
+        # Check if port 8080 is available
+        if _http_port_in_use():
+            return "Port 8080 is already in use, skipping HTTP test"
+        return None
+
+    def http_port_conflict(self) -> Optional[str]:
+        """A failure message when port 8080 is busy in a way that must not count as a skip"""
+        if not HAS_REQUESTS or not _http_port_in_use():
             return None
+        if self.keep_alive:
+            return "Port 8080 is in use by a server that cannot be reused with --keep-alive; HTTP test FAILED"
+        if os.path.exists(KEEP_ALIVE_PID_FILE):
+            return (f"Port 8080 is held by the server kept in {KEEP_ALIVE_PID_FILE}; "
+                    "run with --keep-alive to reuse it or --stop-server to stop it")
+        return None
 
-    def test_http_mode(self) -> bool:
-        """Test HTTP mode"""
+    def start_http_server(self, report: Callable[[str], None] = print) -> Optional[subprocess.Popen]:
+        """Start the HTTP mode server and wait until /health answers; None on failure
+
+        Problems are passed to report, so a background start can hold them back.
+        """
         process = None
+        drain = None
         try:
-            import requests
-            
-            # Check if port 8080 is available
-            import socket
-            with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
-                result = sock.connect_ex(('localhost', 8080))
-                if result == 0:
-                    print("Port 8080 is already in use, skipping HTTP test")
-                    return True
-            
-            # Start HTTP server
-            env = self.setup_env()
-            env['HTTP_MODE'] = 'true'
-            env['HTTP_PORT'] = '8080'
+            if self.keep_alive:
+                # Taken before launch so a JAR rebuilt during the run does not match this server
+                self._http_jar_identity = _jar_identity(self.jar_path)
+                # May outlive this run, so detach it from our pipes and terminal signals
+                process = subprocess.Popen([self.java_path, "-jar", self.jar_path], env=self._http_env,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                                           stdin=subprocess.DEVNULL, start_new_session=True)
+            else:
+                # Nothing reads its stdout; stderr is drained into a bounded tail so a chatty
+                # server cannot fill the pipe while the STDIO tests run
+                process = subprocess.Popen([self.java_path, "-jar", self.jar_path], env=self._http_env,
+                                           stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+                drain = self._start_http_stderr_drain(process)
             
-            process = subprocess.Popen([self.java_path, "-jar", self.jar_path], env=env, 
-                                     stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            self._open_http_session()
             
-            # Wait for server with timeout
-            for i in range(20):
+            # Wait for server: probe the port with plain TCP connects every 25ms and
+            # only confirm with /health once it accepts connections
+            deadline = time.monotonic() + 10
+            while True:
                 # Check if process died
                 if process.poll() is not None:
-                    stdout, stderr = process.communicate()
-                    print(f"HTTP server process died: {stderr}")
-                    return False
-                    
-                try:
-                    response = requests.get("http://localhost:8080/health", timeout=2)
-                    if response.status_code == 200:
-                        break
-                except:
-                    time.sleep(0.5)
-                    continue
-            else:
-                print("HTTP server failed to start within timeout")
-                process.terminate()
-                process.wait(timeout=5)
-                return False
-            
-            # Initialize the HTTP server first
-            init_request = {
-                "jsonrpc": "2.0",
-                "id": 1,
-                "method": "initialize",
-                "params": {
-                    "protocolVersion": "2025-11-25",
-                    "capabilities": {"tools": {}, "resources": {}},
-                    "clientInfo": {"name": "http-test", "version": "1.0"}
-                }
-            }
-            
-            init_response = requests.post("http://localhost:8080/mcp", json=init_request, timeout=10)
-            if init_response.status_code != 200 or not init_response.json().get("result"):
-                process.terminate()
-                return False
-            
-            # Send initialized notification
-            init_notification = {
-                "jsonrpc": "2.0",
-                "method": "notifications/initialized",
-                "params": {}
-            }
+                    report(f"HTTP server process died (exit code {process.returncode})")
+                    if drain:
+                        drain.join(timeout=1)
+                        self._print_stderr_tail(buffer=self._http_stderr_buffer, report=report)
+                    return None
+                
+                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as probe:
+                    probe.settimeout(1)
+                    listening = probe.connect_ex(('localhost', 8080)) == 0
+                if listening:
+                    try:
+                        response = self._http_session.get(_HTTP_HEALTH_URL, timeout=2)
+                        if response.status_code == 200:
+                            return process
+                    except requests.exceptions.RequestException:
+                        pass
+                
+                if time.monotonic() >= deadline:
+                    report("HTTP server failed to start within timeout")
+                    self.stop_http_server(process)
+                    return None
+                time.sleep(0.025)
             
-            requests.post("http://localhost:8080/mcp", json=init_notification, timeout=10)
+        except Exception as e:
+            report(f"HTTP server failed to start: {e}")
+            self.stop_http_server(process)
+            return None
+
+    def _start_http_stderr_drain(self, process: subprocess.Popen) -> threading.Thread:
+        def drain():
+            for line in process.stderr:
+                self._http_stderr_buffer.append(line)
+
+        thread = threading.Thread(target=drain, daemon=True)
+        thread.start()
+        return thread
+
+    def _exercise_http(self, handshake: bool = True) -> bool:
+        """Run the HTTP checks; handshake=False for a server that is already initialized"""
+        session = self._http_session
+        try:
+            if handshake:
+                # Initialize the HTTP server first
+                init_response = session.post(_HTTP_MCP_URL, data=_HTTP_INIT_BODY, timeout=10)
+                if init_response.status_code != 200 or not _loads(init_response.content).get("result"):
+                    return False
+                
+                # Send initialized notification
+                session.post(_HTTP_MCP_URL, data=_HTTP_INITIALIZED_BODY, timeout=10)
             
             # Test basic functionality
-            test = {
-                "jsonrpc": "2.0",
-                "id": 2,
-                "method": "tools/list",
-                "params": {}
-            }
-            
-            response = requests.post("http://localhost:8080/mcp", json=test, timeout=10)
-            success = response.status_code == 200 and response.json().get("result")
+            response = session.post(_HTTP_MCP_URL, data=_HTTP_TOOLS_LIST_BODY, timeout=10)
+            success = response.status_code == 200 and _loads(response.content).get("result")
             
             return success
             
-        except ImportError:
-            print("Requests library not available, skipping HTTP test")
-            return True
         except Exception as e:
             print(f"HTTP test failed: {e}")
             return False
-        finally:
-            # Always cleanup the process
-            if process and process.poll() is None:
+
+    def _open_http_session(self):
+        # One keep-alive connection for the health polls and every MCP call
+        self._http_session = requests.Session()
+        self._http_session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=4))
+        self._http_session.headers.update({"Connection": "keep-alive", "Content-Type": "application/json"})
+
+    def _close_http_session(self):
+        if self._http_session:
+            self._http_session.close()
+            self._http_session = None
+
+    def stop_http_server(self, process: Optional[subprocess.Popen]):
+        """Stop an HTTP server from start_http_server; safe to call more than once"""
+        self._close_http_session()
+        
+        if process and process is not self._http_kept and process.poll() is None:
+            try:
+                process.terminate()
+                process.wait(timeout=5)
+            except:
                 try:
-                    process.terminate()
-                    process.wait(timeout=5)
+                    process.kill()
+                    process.wait()
                 except:
-                    try:
-                        process.kill()
-                        process.wait()
-                    except:
-                        pass
+                    pass
 
     def cleanup_test_data(self):
-        """Clean up test database files"""
+        """Clean up test database files, leaving the test-db directory for the next run"""
         try:
-            import glob
-            import os
-            db_files = glob.glob("test-db/mcptest*")
-            for file_path in db_files:
-                try:
-                    os.remove(file_path)
-                    print(f"Removed database file: {file_path}")
-                except Exception as e:
-                    print(f"Could not remove {file_path}: {e}")
-            
-            # Remove directory if empty
-            try:
-                os.rmdir("test-db")
-                print("Removed test-db directory")
-            except OSError:
-                pass  # Directory not empty or doesn't exist
-        except Exception as e:
+            with os.scandir("test-db") as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        shutil.rmtree(entry.path)
+                    else:
+                        os.remove(entry.path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
             print(f"Error cleaning up database files: {e}")
 
     def run_tests(self) -> bool:
@@ -281,253 +679,46 @@ class SimpleMCPTester:
         print("COMPREHENSIVE MCP TEST SUITE")
         print("=" * 50)
         
-        # Clean any existing database files first
-        try:
-            import glob
-            import os
-            db_files = glob.glob("test-db/mcptest*")
-            for file_path in db_files:
-                try:
-                    os.remove(file_path)
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        
-        # Create test-db directory
-        os.makedirs("test-db", exist_ok=True)
-        
-        tests = [
-            # Initialize
-            {
-                "name": "Initialize",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 1,
-                    "method": "initialize",
-                    "params": {
-                        "protocolVersion": "2025-11-25",
-                        "capabilities": {"tools": {}, "resources": {}},
-                        "clientInfo": {"name": "test", "version": "1.0"}
-                    }
-                }
-            },
-            # Initialized notification (required after initialize)
-            {
-                "name": "Initialized Notification",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "method": "notifications/initialized",
-                    "params": {}
-                }
-            },
-            # List tools
-            {
-                "name": "List Tools",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 2,
-                    "method": "tools/list",
-                    "params": {}
-                }
-            },
-            # List resources
-            {
-                "name": "List Resources",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 3,
-                    "method": "resources/list",
-                    "params": {}
-                }
-            },
-            # Read database info resource
-            {
-                "name": "Read Database Info",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 4,
-                    "method": "resources/read",
-                    "params": {"uri": "database://info"}
-                }
-            },
-            # Create table
-            {
-                "name": "Create Table",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 5,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "CREATE TABLE test_table (id INT PRIMARY KEY, name VARCHAR(50), created_date DATE)"
-                        }
-                    }
-                }
-            },
-            # Insert data
-            {
-                "name": "Insert Data",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 6,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "INSERT INTO test_table VALUES (1, 'John Doe', '2024-01-01'), (2, 'Jane Smith', '2024-01-02')"
-                        }
-                    }
-                }
-            },
-            # Select data
-            {
-                "name": "Select Data",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 7,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "SELECT * FROM test_table ORDER BY id"
-                        }
-                    }
-                }
-            },
-            # Describe table
-            {
-                "name": "Describe Table",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 8,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "describe_table",
-                        "arguments": {
-                            "table_name": "test_table"
-                        }
-                    }
-                }
-            },
-            # Read table metadata resource
-            {
-                "name": "Read Table Metadata",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 9,
-                    "method": "resources/read",
-                    "params": {"uri": "database://table/TEST_TABLE"}
-                }
-            },
-            # Parameterized insert
-            {
-                "name": "Parameterized Insert",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 10,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "INSERT INTO test_table VALUES (?, ?, ?)",
-                            "params": [3, "Alice Brown", "2024-01-03"]
-                        }
-                    }
-                }
-            },
-            # Parameterized select (single param)
-            {
-                "name": "Parameterized Select (Single)",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 11,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "SELECT * FROM test_table WHERE id = ?",
-                            "params": [3]
-                        }
-                    }
-                }
-            },
-            # Parameterized select (multiple params)
-            {
-                "name": "Parameterized Select (Multiple)",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 12,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "SELECT * FROM test_table WHERE name LIKE ? AND id > ?",
-                            "params": ["%e%", 1]
-                        }
-                    }
-                }
-            },
-            # Parameterized select (range)
-            {
-                "name": "Parameterized Select (Range)",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 13,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "SELECT * FROM test_table WHERE id BETWEEN ? AND ? ORDER BY id",
-                            "params": [2, 4]
-                        }
-                    }
-                }
-            },
-            # Empty params array (backward compatibility)
-            {
-                "name": "Empty Params Array",
-                "request": {
-                    "jsonrpc": "2.0",
-                    "id": 14,
-                    "method": "tools/call",
-                    "params": {
-                        "name": "run_sql",
-                        "arguments": {
-                            "sql": "SELECT COUNT(*) as total_count FROM test_table",
-                            "params": []
-                        }
-                    }
-                }
-            }
-        ]
-        
         # Start persistent process
         self.start_process()
         
+        # Boot the HTTP mode server in the background while the STDIO tests run;
+        # each JVM has its own in-memory database
+        http_server = None
+        http_messages: List[str] = []
+        if (not self.reuse_http_server() and self.http_port_conflict() is None
+                and self.http_skip_reason() is None):
+            http_starter = ThreadPoolExecutor(max_workers=1)
+            http_server = http_starter.submit(self.start_http_server, http_messages.append)
+            http_starter.shutdown(wait=False)
+        
         try:
-            passed = 0
-            total = len(tests)
+            total = sum(1 for *_, is_warmup in _SERIALIZED if not is_warmup)
+            # name -> (passed, response)
+            results: Dict[str, Tuple[bool, Optional[Dict[str, Any]]]] = {}
+            
+            # Send every request up front; the server answers them in order
+            responses = self.send_requests_batch([request for _, request, _, _ in _SERIALIZED],
+                                                 [line for _, _, line, _ in _SERIALIZED])
             
-            for test in tests:
-                print(f"Testing {test['name']}...")
-                response = self.send_request(test['request'])
+            for name, request, _, is_warmup in _SERIALIZED:
+                if is_warmup:
+                    continue
+                print(f"Testing {name}...")
                 
                 # Notifications don't expect a response
-                is_notification = 'id' not in test['request']
+                is_notification = 'id' not in request
+                response = None if is_notification else responses.get(request['id'])
                 
                 if is_notification:
                     # For notifications, success is no error response
-                    if not response or 'error' not in response:
-                        print("PASS")
-                        passed += 1
-                    else:
-                        print("FAIL")
-                        print(f"   Error: {response['error']}")
-                elif response and 'result' in response:
+                    ok = not response or 'error' not in response
+                else:
+                    ok = bool(response) and 'result' in response
+                results[name] = (ok, response)
+                
+                if ok:
                     print("PASS")
-                    passed += 1
                 else:
                     print("FAIL")
                     if response and 'error' in response:
@@ -535,9 +726,12 @@ class SimpleMCPTester:
                     elif response:
                         print(f"   Response: {response}")
             
+            failed = [name for name, (ok, _) in results.items() if not ok]
+            passed = total - len(failed)
+            
             # Test HTTP mode
             print(f"\nTesting HTTP mode...")
-            http_ok = self.test_http_mode()
+            http_ok = self.test_http_mode(http_server, http_messages)
             print(f"HTTP test: {'PASS' if http_ok else 'FAIL'}")
             
             print(f"\nResults: {passed}/{total} STDIO tests passed")
@@ -545,16 +739,17 @@ class SimpleMCPTester:
             print(f"Overall: {'SUCCESS' if overall_success else 'SOME FAILED'}")
             
             # Print detailed summary
-            if passed < total:
+            if failed:
                 print(f"\nFailed tests:")
-                for i, test in enumerate(tests):
-                    if i < len(tests) and not (i == 0 or (i > 0 and passed > i-1)):
-                        continue  # This is a simple check, could be improved
+                for name in failed:
+                    print(f"   {name}")
                 
             return overall_success
             
         finally:
             self.stop_process()
+            if http_server:
+                self.stop_http_server(http_server.result())
             # Cleanup test data
             try:
                 self.cleanup_test_data()
@@ -562,6 +757,19 @@ class SimpleMCPTester:
                 print(f"Error during cleanup: {e}")
 
 def main():
+    parser = argparse.ArgumentParser(description="Simple DBChat MCP server test (STDIO and HTTP)")
+    parser.add_argument("--keep-alive", action="store_true",
+                        help="Leave the HTTP server running after a passing run and reuse it next "
+                             f"time (its PID is written to {KEEP_ALIVE_PID_FILE})")
+    parser.add_argument("--stop-server", action="store_true",
+                        help="Stop the HTTP server left running by --keep-alive and exit")
+    args = parser.parse_args()
+    
+    if args.stop_server:
+        if not stop_kept_http_server():
+            print(f"No kept HTTP server recorded in {KEEP_ALIVE_PID_FILE}")
+        sys.exit(0)
+    
     # Find JAR file
     jars = glob.glob("target/dbchat-*.jar")
     if not jars:
@@ -578,7 +786,7 @@ def main():
         print("Error: Java is not installed or not in PATH")
         sys.exit(1)
     
-    tester = SimpleMCPTester(jar_path)
+    tester = SimpleMCPTester(jar_path, keep_alive=args.keep_alive)
     
     try:
         success = tester.run_tests()